@@ -13,14 +13,22 @@ Características:
 import argparse
 import csv
 import datetime as dt
-import json
 import os
+import sqlite3
 import sys
-from decimal import Decimal
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
+from typing import Any, DefaultDict, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union, cast
 
-import boto3
+try:  # orjson es opcional: si está instalado se usa para decodificar JSON más rápido.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 DEFAULT_CONFIG = {
@@ -28,25 +36,45 @@ DEFAULT_CONFIG = {
     "default_months": 6,
     "output_dir": ".",
     "export_files_by_default": True,
+    "account_profiles": {},
+    "cache_dir": "~/.cache/aws-billing",
+    "max_workers": 16,
 }
 DEFAULT_OUTPUT_BASENAME = "monthly_costs"
 DEFAULT_PROFILE_LABEL = "__default__"
 DEFAULT_PROFILE_DISPLAY = "default"
+MONTH_WORKERS = 8  # tope de rangos consultados en paralelo por perfil (dentro de max_workers)
+STATUS_MIN_INTERVAL = 0.05  # segundos entre repintados de la línea de estado
+CACHE_FILENAME = "costs.sqlite3"
+TOTAL_ACCOUNT_KEY = ""
+CACHE_SCHEMA_VERSION = 5
+MICROS_PER_UNIT = 1_000_000
+CURRENT_MONTH_CACHE_TTL = 3600  # segundos; Cost Explorer actualiza los datos pocas veces al día
+ACCOUNT_NAMES_CACHE_TTL = 7 * 24 * 3600  # segundos; las cuentas pueden renombrarse
+CLOSED_MONTH_GRACE_DAYS = 3  # Cost Explorer sigue ajustando el mes anterior unos días tras el cierre
+FORMAT_SUFFIXES = {"table": ".txt", "csv": ".csv", "tsv": ".tsv"}
+SUFFIX_FORMATS = {suffix: fmt for fmt, suffix in FORMAT_SUFFIXES.items()}
+THOUSANDS_SEPARATOR = str.maketrans({",": "."})
+TSV_SPECIAL_CHARS = ('"', "\t", "\r", "\n")  # las etiquetas de cuenta son texto libre de AWS
+
+_ACCOUNT_NAMES: Dict[str, str] = {}
+_ACCOUNT_NAME_LOOKUPS: Dict[str, threading.Event] = {}
+_ACCOUNT_NAMES_LOCK = threading.Lock()
+_CACHE_FAILED = threading.Event()
+_CACHE_FAILED_LOCK = threading.Lock()
 
 
 def load_config() -> Dict[str, Any]:
     config = DEFAULT_CONFIG.copy()
     config_path = os.environ.get("MONTHLY_COSTS_CONFIG")
     path = Path(config_path).expanduser() if config_path else PROJECT_ROOT / "config.json"
-    if path.exists():
-        try:
-            with path.open("r", encoding="utf-8") as cfg:
-                data = json.load(cfg)
-            for key in DEFAULT_CONFIG:
-                if key in data:
-                    config[key] = data[key]
-        except Exception as exc:  # pylint: disable=broad-except
-            print(f"# No se pudo leer la configuración en {path}: {exc}")
+    try:
+        data = json_loads(path.read_bytes())
+        config.update({key: data[key] for key in DEFAULT_CONFIG if key in data})
+    except FileNotFoundError:
+        pass
+    except Exception as exc:  # pylint: disable=broad-except
+        print(f"# No se pudo leer la configuración en {path}: {exc}")
     return config
 
 
@@ -56,10 +84,44 @@ def month_start(date: dt.date) -> dt.date:
 
 def shift_months(reference: dt.date, offset: int) -> dt.date:
     """Devuelve el inicio de mes desplazado `offset` meses desde `reference`."""
-    month_index = reference.month - 1 + offset
-    year = reference.year + month_index // 12
-    month = month_index % 12 + 1
-    return dt.date(year, month, 1)
+    year, month_index = divmod(reference.year * 12 + reference.month - 1 + offset, 12)
+    return dt.date(year, month_index + 1, 1)
+
+
+@lru_cache(maxsize=32)
+def month_range(start_date: dt.date, end_date: dt.date) -> Tuple[dt.date, ...]:
+    """Inicios de mes en el rango `[start_date, end_date)`.
+
+    Se memoiza porque todos los perfiles consultan el mismo rango.
+    """
+    months = []
+    current = month_start(start_date)
+    while current < end_date:
+        months.append(current)
+        current = shift_months(current, 1)
+    return tuple(months)
+
+
+def to_micros(amount: str) -> int:
+    """Convierte un monto de Cost Explorer (texto en USD) a millonésimas enteras.
+
+    Se acumula con esa precisión para redondear una sola vez, al mostrar.
+    """
+    return round(float(amount) * MICROS_PER_UNIT)
+
+
+def micros_to_units(micros: int) -> int:
+    """Redondea millonésimas a unidades enteras (redondeo bancario, como `quantize`)."""
+    units, remainder = divmod(micros, MICROS_PER_UNIT)
+    half = MICROS_PER_UNIT // 2
+    if remainder > half or (remainder == half and units % 2):
+        units += 1
+    return units
+
+
+def month_count(value: str) -> int:
+    """Tipo de argparse para `--months`: entero, como mínimo 1."""
+    return max(1, int(value))
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -74,7 +136,7 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--months",
-        type=int,
+        type=month_count,
         default=None,
         help="Cantidad de meses a incluir (incluye el mes actual).",
     )
@@ -114,6 +176,12 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Desglosar resultados por cuenta vinculada (LINKED_ACCOUNT).",
     )
+    parser.add_argument(
+        "--no-resolve-names",
+        dest="resolve_names",
+        action="store_false",
+        help="Con --by-account, no consultar los nombres de las cuentas (se muestra el ID).",
+    )
     parser.add_argument(
         "--output",
         type=Path,
@@ -122,6 +190,7 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--format",
+        type=str.lower,
         choices=["table", "csv", "tsv", "all"],
         default=None,
         help="Formato de archivo de salida (table, csv, tsv o all).",
@@ -133,10 +202,133 @@ def build_parser() -> argparse.ArgumentParser:
         help="Perfiles a excluir cuando se usa --all-profiles (opción repetible). "
         "También puedes usar la variable de entorno MONTHLY_COSTS_EXCLUDE con una lista separada por comas.",
     )
-    parser.set_defaults(header=True)
+    parser.add_argument(
+        "--payer-profile",
+        dest="payer_profile",
+        default=None,
+        help="Perfil de la cuenta pagadora (organización). Los perfiles definidos en "
+        "`account_profiles` del config se consultan con una sola llamada agrupada por cuenta.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="No usar el caché local de meses cerrados; consulta todo en Cost Explorer.",
+    )
+    parser.add_argument(
+        "--quiet",
+        dest="quiet",
+        action="store_true",
+        help="No imprimir la tabla en consola (solo se generan los archivos).",
+    )
+    parser.set_defaults(header=True, use_cache=True, resolve_names=True)
     return parser
 
 
+def list_profiles() -> Set[str]:
+    """Perfiles definidos en los archivos de configuración y credenciales de AWS.
+
+    Lee los archivos directamente (respetando `AWS_CONFIG_FILE` y
+    `AWS_SHARED_CREDENTIALS_FILE`) sin crear una sesión de boto3.
+    """
+    from botocore.configloader import load_config, raw_config_parse  # pylint: disable=import-outside-toplevel
+    from botocore.exceptions import ConfigNotFound  # pylint: disable=import-outside-toplevel
+
+    profiles: Set[str] = set()
+    try:
+        profiles.update(load_config(os.environ.get("AWS_CONFIG_FILE", "~/.aws/config")).get("profiles", {}))
+    except ConfigNotFound:
+        pass
+    try:
+        profiles.update(raw_config_parse(os.environ.get("AWS_SHARED_CREDENTIALS_FILE", "~/.aws/credentials")))
+    except ConfigNotFound:
+        pass
+    return profiles
+
+
+def has_default_credentials() -> bool:
+    """Indica si la cadena de credenciales por defecto (variables de entorno, IMDS, etc.) resuelve algo."""
+    import boto3  # pylint: disable=import-outside-toplevel
+
+    return boto3.Session().get_credentials() is not None
+
+
+@lru_cache(maxsize=None)
+def _ce_client(profile: Optional[str]):
+    """Cliente de Cost Explorer reutilizable por perfil (evita resolver credenciales de nuevo)."""
+    import boto3  # pylint: disable=import-outside-toplevel
+    from botocore.config import Config  # pylint: disable=import-outside-toplevel
+
+    # Cost Explorer limita la tasa de llamadas con fuerza: los reintentos adaptativos
+    # aplican backoff ante `ThrottlingException` y el pool cubre las consultas en paralelo.
+    config = Config(
+        max_pool_connections=32,
+        retries={"mode": "adaptive", "max_attempts": 10},
+        connect_timeout=5,
+        read_timeout=30,
+        user_agent_extra="aws-billing",
+    )
+    session = boto3.Session(profile_name=profile) if profile else boto3.Session()
+    return session.client("ce", config=config)
+
+
+def _iter_pages(operation, params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Genera las páginas de una operación de Cost Explorer siguiendo `NextPageToken`.
+
+    `params` no se modifica; el token se agrega en una copia por página.
+    """
+    token: Optional[str] = None
+    while True:
+        page_params = {**params, "NextPageToken": token} if token else params
+        response = operation(**page_params)
+        yield response
+        token = response.get("NextPageToken")
+        if not token:
+            return
+
+
+def month_spans(months: Sequence[dt.date]) -> List[Tuple[dt.date, dt.date]]:
+    """Agrupa inicios de mes ordenados en rangos contiguos `[inicio, fin)`."""
+    spans: List[Tuple[dt.date, dt.date]] = []
+    for month in months:
+        if spans and spans[-1][1] == month:
+            spans[-1] = (spans[-1][0], shift_months(month, 1))
+        else:
+            spans.append((month, shift_months(month, 1)))
+    return spans
+
+
+def _iter_span_pages(
+    ce,
+    params: Dict[str, object],
+    spans: Sequence[Tuple[dt.date, dt.date]],
+    start_date: dt.date,
+    end_date: dt.date,
+    workers: int,
+) -> Iterator[Dict[str, Any]]:
+    """Consulta cada rango por separado (en paralelo si son varios) y genera todas las páginas.
+
+    Sin caché hay un solo rango; solo se parte en varios cuando el caché deja huecos.
+    """
+
+    def span_params(span: Tuple[dt.date, dt.date]) -> Dict[str, object]:
+        period_start = max(span[0], start_date)
+        period_end = min(span[1], end_date)
+        return {**params, "TimePeriod": {"Start": period_start.isoformat(), "End": period_end.isoformat()}}
+
+    if len(spans) == 1 or workers <= 1:
+        for span in spans:
+            yield from _iter_pages(ce.get_cost_and_usage, span_params(span))
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(spans))) as executor:
+        futures = [
+            executor.submit(lambda sp: list(_iter_pages(ce.get_cost_and_usage, span_params(sp))), span)
+            for span in spans
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
 def query_costs(
     profile: Optional[str],
     start_date: dt.date,
@@ -145,13 +337,44 @@ def query_costs(
     exclude_credits: bool = False,
     only_credits: bool = False,
     group_by_account: bool = False,
-) -> Tuple[Union[Dict[str, Decimal], Dict[str, Dict[str, Decimal]]], Dict[str, str]]:
-    session = boto3.Session(profile_name=profile) if profile else boto3.Session()
-    ce = session.client("ce")
+    cache_path: Optional[Path] = None,
+    resolve_names: bool = True,
+    month_workers: int = MONTH_WORKERS,
+) -> Tuple[Union[Dict[str, int], Dict[str, Dict[str, int]]], Dict[str, str]]:
+    # Los meses cerrados ya consultados se leen del caché (y el mes en curso si se consultó
+    # hace menos de CURRENT_MONTH_CACHE_TTL); solo se piden a Cost Explorer los meses faltantes.
+    cache_profile = profile or DEFAULT_PROFILE_LABEL
+    cache_key = "|".join(
+        [
+            f"excl={int(exclude_credits)}",
+            f"only={int(only_credits)}",
+            f"group={int(group_by_account)}",
+            "accounts=" + ",".join(sorted(accounts or [])),
+        ]
+    )
+    all_months = month_range(start_date, end_date)
+    current_month = month_start(dt.date.today())
+    cached: Dict[str, Dict[str, int]] = {}
+    missing_months: Sequence[dt.date] = all_months
+    if _CACHE_FAILED.is_set():
+        cache_path = None
+    if cache_path:
+        cacheable_months = [m.isoformat() for m in all_months if m <= current_month]
+        try:
+            cached, cached_months = load_cached_costs(
+                cache_path,
+                cache_profile,
+                cache_key,
+                cacheable_months,
+                fresh_after=time.time() - CURRENT_MONTH_CACHE_TTL,
+            )
+        except (OSError, sqlite3.Error) as exc:
+            _disable_cache(cache_path, exc)
+            cache_path = None
+        else:
+            missing_months = [m for m in all_months if m.isoformat() not in cached_months]
 
-    time_period = {"Start": start_date.isoformat(), "End": end_date.isoformat()}
     params: Dict[str, object] = {
-        "TimePeriod": time_period,
         "Granularity": "MONTHLY",
         "Metrics": ["UnblendedCost"],
     }
@@ -198,36 +421,232 @@ def query_costs(
             }
         ]
 
-    if group_by_account:
-        totals_by_account: Dict[str, Dict[str, Decimal]] = {}
-        account_names: Dict[str, str] = {}
-    else:
-        totals: Dict[str, Decimal] = {}
-        account_names = {}
-    token: Optional[str] = None
-    while True:
-        if token:
-            params["NextPageToken"] = token
-        response = ce.get_cost_and_usage(**params)
+    # Un solo camino de agregación: `{cuenta: {mes: millonésimas}}`, donde TOTAL_ACCOUNT_KEY
+    # representa el total del perfil cuando no se agrupa por cuenta (igual que en el caché).
+    totals_by_account: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
+    pages: Iterator[Dict[str, Any]] = iter(())
+    if missing_months:
+        pages = _iter_span_pages(
+            _ce_client(profile), params, month_spans(missing_months), start_date, end_date, month_workers
+        )
+    for response in pages:
         for item in response["ResultsByTime"]:
             month = item["TimePeriod"]["Start"]
             if group_by_account:
-                for group in item.get("Groups", []):
-                    account_id = group["Keys"][0]
-                    amount = Decimal(group["Metrics"]["UnblendedCost"]["Amount"])
-                    account_totals = totals_by_account.setdefault(account_id, {})
-                    account_totals[month] = account_totals.get(month, Decimal("0")) + amount
+                groups = item.get("Groups", [])
             else:
-                amount = Decimal(item["Total"]["UnblendedCost"]["Amount"])
-                totals[month] = totals.get(month, Decimal("0")) + amount
-        token = response.get("NextPageToken")
-        if not token:
-            break
+                groups = [{"Keys": [TOTAL_ACCOUNT_KEY], "Metrics": item["Total"]}]
+            for group in groups:
+                totals_by_account[group["Keys"][0]][month] += to_micros(group["Metrics"]["UnblendedCost"]["Amount"])
+
+    if cache_path:
+        fetched_months = [m.isoformat() for m in missing_months if m <= current_month]
+        # Un mes recién terminado todavía recibe ajustes: recién se marca como cerrado
+        # pasados CLOSED_MONTH_GRACE_DAYS días; mientras tanto vence como el mes en curso.
+        settled_before = month_start(dt.date.today() - dt.timedelta(days=CLOSED_MONTH_GRACE_DAYS))
+        try:
+            store_cached_costs(
+                cache_path,
+                cache_profile,
+                cache_key,
+                fetched_months,
+                totals_by_account,
+                open_month=settled_before.isoformat(),
+            )
+        except (OSError, sqlite3.Error) as exc:
+            _disable_cache(cache_path, exc)
+        for account_id, month_values in cached.items():
+            totals_by_account[account_id].update(month_values)
+
+    if not group_by_account:
+        return dict(totals_by_account.get(TOTAL_ACCOUNT_KEY, {})), {}
+    account_names: Dict[str, str] = {}
+    if resolve_names:
+        # Compartido entre perfiles: cada cuenta con nombre se consulta una sola vez por ejecución.
+        account_names = resolve_account_names(profile, start_date, end_date, list(totals_by_account.keys()), cache_path)
+    return {account_id: dict(month_values) for account_id, month_values in totals_by_account.items()}, account_names
+
+
+def _disable_cache(cache_path: Path, exc: Exception) -> None:
+    """Desactiva el caché para el resto de la ejecución, avisando una sola vez."""
+    with _CACHE_FAILED_LOCK:
+        if _CACHE_FAILED.is_set():
+            return
+        _CACHE_FAILED.set()
+    print(f"# No se pudo usar el caché en {cache_path} ({exc}); se consulta sin caché.")
+
+
+def _cache_connect(cache_path: Path) -> sqlite3.Connection:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(cache_path), timeout=30)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_SCHEMA_VERSION:
+        # Es solo un caché: ante un esquema anterior se descarta y se vuelve a poblar.
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS cached_months")
+            conn.execute("DROP TABLE IF EXISTS cached_costs")
+            conn.execute("DROP TABLE IF EXISTS account_names")
+            conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cached_months ("
+        "profile TEXT, query_key TEXT, month TEXT, fetched_at REAL, closed INTEGER, "
+        "PRIMARY KEY (profile, query_key, month))"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cached_costs ("
+        "profile TEXT, query_key TEXT, month TEXT, account TEXT, micros INTEGER, "
+        "PRIMARY KEY (profile, query_key, month, account))"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS account_names (account TEXT PRIMARY KEY, name TEXT, fetched_at REAL)")
+    return conn
+
+
+def load_cached_costs(
+    cache_path: Path,
+    profile: str,
+    query_key: str,
+    months: List[str],
+    fresh_after: float,
+) -> Tuple[Dict[str, Dict[str, int]], Set[str]]:
+    """Montos cacheados (`{cuenta: {mes: millonésimas}}`) y meses disponibles.
+
+    Los meses guardados ya cerrados no vencen; el resto solo si es posterior a `fresh_after`.
+    """
+    if not months:
+        return {}, set()
+    placeholders = ",".join("?" * len(months))
+    cached_months: Set[str] = set()
+    amounts: Dict[str, Dict[str, int]] = {}
+    with closing(_cache_connect(cache_path)) as conn:
+        for month, account_id, micros in conn.execute(
+            "SELECT m.month, c.account, c.micros FROM cached_months m "
+            "LEFT JOIN cached_costs c USING (profile, query_key, month) "
+            f"WHERE m.profile = ? AND m.query_key = ? AND m.month IN ({placeholders}) "
+            "AND (m.closed OR m.fetched_at >= ?)",
+            (profile, query_key, *months, fresh_after),
+        ):
+            cached_months.add(month)
+            if account_id is not None:
+                amounts.setdefault(account_id, {})[month] = micros
+    return amounts, cached_months
+
+
+def store_cached_costs(
+    cache_path: Path,
+    profile: str,
+    query_key: str,
+    months: List[str],
+    amounts: Dict[str, Dict[str, int]],
+    open_month: str,
+) -> None:
+    """Guarda los montos consultados de `months`, reemplazando lo cacheado para esos meses.
+
+    Solo se marcan como cerrados (sin vencimiento) los meses anteriores a `open_month`.
+    """
+    if not months:
+        return
+    month_set = set(months)
+    fetched_at = time.time()
+    with closing(_cache_connect(cache_path)) as conn, conn:
+        conn.executemany(
+            "DELETE FROM cached_costs WHERE profile = ? AND query_key = ? AND month = ?",
+            [(profile, query_key, month) for month in months],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO cached_costs (profile, query_key, month, account, micros) VALUES (?, ?, ?, ?, ?)",
+            [
+                (profile, query_key, month, account_id, micros)
+                for account_id, month_values in amounts.items()
+                for month, micros in month_values.items()
+                if month in month_set
+            ],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO cached_months (profile, query_key, month, fetched_at, closed) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(profile, query_key, month, fetched_at, month < open_month) for month in months],
+        )
 
-    if group_by_account:
-        account_names = fetch_account_names(ce, start_date, end_date, list(totals_by_account.keys()))
-        return totals_by_account, account_names
-    return totals, account_names
+
+def resolve_account_names(
+    profile: Optional[str],
+    start_date: dt.date,
+    end_date: dt.date,
+    account_ids: List[str],
+    cache_path: Optional[Path] = None,
+) -> Dict[str, str]:
+    """Nombres de cuentas compartidos entre perfiles: una sola consulta por cuenta y ejecución."""
+    ids = list(dict.fromkeys(account_ids))
+    attempted: Set[str] = set()
+    while True:
+        with _ACCOUNT_NAMES_LOCK:
+            pending = [a for a in ids if a not in _ACCOUNT_NAMES and a not in attempted]
+            if not pending:
+                return {a: _ACCOUNT_NAMES[a] for a in ids if _ACCOUNT_NAMES.get(a)}
+            claimed = [a for a in pending if a not in _ACCOUNT_NAME_LOOKUPS]
+            in_flight = {_ACCOUNT_NAME_LOOKUPS[a] for a in pending if a in _ACCOUNT_NAME_LOOKUPS}
+            done = threading.Event()
+            for account_id in claimed:
+                _ACCOUNT_NAME_LOOKUPS[account_id] = done
+        if not claimed:
+            # Otro perfil ya las está consultando: al terminar se reintenta solo lo que falte.
+            for event in in_flight:
+                event.wait()
+            continue
+        names: Dict[str, str] = {}
+        try:
+            found = _lookup_account_names(profile, start_date, end_date, claimed, cache_path)
+            # El perfil ve estas cuentas (vienen de sus costos): sin nombre es la respuesta.
+            names = {account_id: found.get(account_id, "") for account_id in claimed}
+        finally:
+            with _ACCOUNT_NAMES_LOCK:
+                _ACCOUNT_NAMES.update(names)
+                for account_id in claimed:
+                    del _ACCOUNT_NAME_LOOKUPS[account_id]
+            done.set()
+        attempted.update(claimed)
+
+
+def _lookup_account_names(
+    profile: Optional[str],
+    start_date: dt.date,
+    end_date: dt.date,
+    account_ids: List[str],
+    cache_path: Optional[Path],
+) -> Dict[str, str]:
+    """Busca los nombres en el caché en disco y consulta a Cost Explorer los que falten."""
+    known: Dict[str, str] = {}
+    if _CACHE_FAILED.is_set():
+        cache_path = None
+    if cache_path:
+        placeholders = ",".join("?" * len(account_ids))
+        try:
+            with closing(_cache_connect(cache_path)) as conn:
+                known.update(
+                    conn.execute(
+                        f"SELECT account, name FROM account_names WHERE account IN ({placeholders}) "
+                        "AND fetched_at >= ?",
+                        (*account_ids, time.time() - ACCOUNT_NAMES_CACHE_TTL),
+                    )
+                )
+        except (OSError, sqlite3.Error) as exc:
+            _disable_cache(cache_path, exc)
+            cache_path = None
+    missing = [a for a in account_ids if a not in known]
+    if missing:
+        names = fetch_account_names(_ce_client(profile), start_date, end_date, missing)
+        resolved = {account_id: names[account_id] for account_id in missing if account_id in names}
+        known.update(resolved)
+        if resolved and cache_path:
+            fetched_at = time.time()
+            try:
+                with closing(_cache_connect(cache_path)) as conn, conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO account_names (account, name, fetched_at) VALUES (?, ?, ?)",
+                        [(account_id, name, fetched_at) for account_id, name in resolved.items()],
+                    )
+            except (OSError, sqlite3.Error) as exc:
+                _disable_cache(cache_path, exc)
+    return known
 
 
 def fetch_account_names(
@@ -249,11 +668,7 @@ def fetch_account_names(
         }
 
     names: Dict[str, str] = {}
-    token: Optional[str] = None
-    while True:
-        if token:
-            params["NextPageToken"] = token
-        response = client.get_dimension_values(**params)
+    for response in _iter_pages(client.get_dimension_values, params):
         for item in response.get("DimensionValues", []):
             account_id = item.get("Value")
             if not account_id:
@@ -262,9 +677,6 @@ def fetch_account_names(
             description = attrs.get("Description") or attrs.get("description") or ""
             if description:
                 names[account_id] = description
-        token = response.get("NextPageToken")
-        if not token:
-            break
     return names
 
 
@@ -273,8 +685,8 @@ def main() -> None:
     config = load_config()
 
     default_months = int(config.get("default_months", DEFAULT_CONFIG["default_months"]))
-    months = int(args.months) if args.months is not None else default_months
-    months = max(1, months)
+    max_workers = max(1, int(config.get("max_workers", DEFAULT_CONFIG["max_workers"])))
+    months = args.months if args.months is not None else max(1, default_months)
 
     if args.exclude_credits and args.only_credits:
         raise SystemExit("No puedes usar --exclude-credits y --only-credits al mismo tiempo.")
@@ -283,60 +695,48 @@ def main() -> None:
     if "output_dir" not in config and "reports_dir" in config:
         output_dir_config = config["reports_dir"]
 
-    output_dir = Path(output_dir_config).expanduser()
-    if not output_dir.is_absolute():
-        output_dir = (PROJECT_ROOT / output_dir).resolve()
-
+    # Se resuelve una sola vez la ruta base; las rutas por formato se derivan de ella.
     if args.output:
         output_path = Path(args.output).expanduser()
         if not output_path.is_absolute():
             output_path = (PROJECT_ROOT / output_path).resolve()
     else:
+        output_dir = Path(output_dir_config).expanduser()
+        if not output_dir.is_absolute():
+            output_dir = (PROJECT_ROOT / output_dir).resolve()
         output_path = output_dir / DEFAULT_OUTPUT_BASENAME
 
+    cache_path: Optional[Path] = None
+    if args.use_cache and config.get("cache_dir"):
+        cache_path = Path(config["cache_dir"]).expanduser() / CACHE_FILENAME
+
     export_files_by_default = bool(
         config.get("export_files_by_default", DEFAULT_CONFIG["export_files_by_default"])
     )
 
     formats_to_generate: List[str]
+    output_suffix_format = SUFFIX_FORMATS.get(output_path.suffix.lower()) if args.output else None
     if args.format:
-        selected = args.format.lower()
-        if selected == "all":
+        if args.format == "all":
             formats_to_generate = ["table", "csv", "tsv"]
         else:
-            formats_to_generate = [selected]
+            formats_to_generate = [args.format]
+    elif output_suffix_format:
+        # `--output` con extensión conocida: solo se genera ese formato.
+        formats_to_generate = [output_suffix_format]
     elif export_files_by_default:
         formats_to_generate = ["table", "csv", "tsv"]
     else:
         formats_to_generate = []
 
-    for fmt in list(formats_to_generate):
-        if fmt not in {"table", "csv", "tsv"}:
-            print(f"# Formato desconocido '{fmt}', se omitirá.")
-            formats_to_generate.remove(fmt)
-
-    if not formats_to_generate and args.format:
-        print("# No se generarán archivos porque no se seleccionaron formatos válidos.")
-
-    # Determina rutas finales por formato
-    output_files: Dict[str, Path] = {}
-    base_path = output_path
-
-    for fmt in formats_to_generate:
-        suffix = base_path.suffix.lower()
-        if fmt == "csv":
-            target = base_path.with_suffix(".csv") if base_path.suffix else base_path.with_name(f"{base_path.name}.csv")
-        elif fmt == "tsv":
-            target = base_path.with_suffix(".tsv") if base_path.suffix else base_path.with_name(f"{base_path.name}.tsv")
-        else:  # table
-            target = base_path.with_suffix(".txt") if suffix in {".csv", ".tsv"} else base_path.with_suffix(".txt") if base_path.suffix else base_path.with_name(f"{base_path.name}.txt")
-        if not target.is_absolute():
-            target = (PROJECT_ROOT / target).resolve()
-        output_files[fmt] = target
-        target.parent.mkdir(parents=True, exist_ok=True)
-
-    base_session = boto3.Session()
-    available_profiles = base_session.available_profiles
+    # Determina rutas finales por formato. `output_path` ya es absoluta y todos los
+    # archivos comparten carpeta, así que solo cambia la extensión.
+    output_files: Dict[str, Path] = {
+        fmt: output_path.with_suffix(FORMAT_SUFFIXES[fmt]) for fmt in formats_to_generate
+    }
+    if output_files:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
     excluded: Set[str] = set(config.get("ignore_profiles", []))
     env_exclude = os.environ.get("MONTHLY_COSTS_EXCLUDE")
     if env_exclude:
@@ -347,8 +747,8 @@ def main() -> None:
     if args.profiles:
         profiles = list(dict.fromkeys(args.profiles))
     else:
-        profiles = [p for p in available_profiles if p not in excluded]
-        if not profiles and base_session.get_credentials() is not None and DEFAULT_PROFILE_DISPLAY not in excluded:
+        profiles = sorted(list_profiles() - excluded)
+        if not profiles and DEFAULT_PROFILE_DISPLAY not in excluded and has_default_credentials():
             profiles = [DEFAULT_PROFILE_LABEL]
         if args.all_profiles and not profiles:
             raise SystemExit("No se encontraron perfiles disponibles después de aplicar los excluidos.")
@@ -358,68 +758,127 @@ def main() -> None:
     if not profiles:
         raise SystemExit("No se encontraron perfiles para consultar.")
 
-    if args.profiles:
-        profiles = list(dict.fromkeys(profiles))
-    else:
-        profiles = sorted(set(profiles))
-
     today = dt.date.today()
     current_month = month_start(today)
     start = shift_months(current_month, -(months - 1))
     end = shift_months(current_month, 1)
 
-    results: Dict[str, Dict[str, Decimal]] = {}
+    results: Dict[str, Dict[str, int]] = {}
     all_months: set[str] = set()
     exclude_credits = bool(args.exclude_credits)
     only_credits = bool(args.only_credits)
     by_account = bool(args.by_account)
+    resolve_names = bool(args.resolve_names)
 
     status_displayed = False
+    last_status_at = 0.0
 
     def show_status(message: str) -> None:
-        nonlocal status_displayed
-        if not status_displayed:
-            sys.stdout.write("\n")
-            status_displayed = True
-        else:
-            sys.stdout.write("\033[F\033[2K")
-        sys.stdout.write(message + "\n")
+        # Con muchos perfiles en paralelo las respuestas llegan en ráfaga: se repinta como
+        # máximo cada STATUS_MIN_INTERVAL segundos, con una sola escritura por evento.
+        nonlocal status_displayed, last_status_at
+        now = time.monotonic()
+        if status_displayed and now - last_status_at < STATUS_MIN_INTERVAL:
+            return
+        prefix = "\033[F\033[2K" if status_displayed else "\n"
+        status_displayed = True
+        last_status_at = now
+        sys.stdout.write(prefix + message + "\n")
         sys.stdout.flush()
 
     def clear_status() -> None:
         nonlocal status_displayed
         if status_displayed:
-            sys.stdout.write("\033[F\033[2K")
-            sys.stdout.write("\033[F\033[2K")
-            sys.stdout.write("\n")
+            sys.stdout.write("\033[F\033[2K\033[F\033[2K\n")
             sys.stdout.flush()
             status_displayed = False
 
-    total_profiles = len(profiles)
+    # Con --payer-profile, los perfiles mapeados a una cuenta en `account_profiles` se
+    # resuelven con una única consulta a la cuenta pagadora agrupada por LINKED_ACCOUNT.
+    account_profiles = {
+        str(name): str(account_id) for name, account_id in (config.get("account_profiles") or {}).items()
+    }
+    payer_members: List[str] = []
+    member_accounts: List[str] = []
+    if args.payer_profile:
+        payer_members = [p for p in profiles if p in account_profiles]
+        member_accounts = sorted({account_profiles[p] for p in payer_members})
+        if args.accounts:
+            member_accounts = [a for a in member_accounts if a in args.accounts]
+            payer_members = [p for p in payer_members if account_profiles[p] in member_accounts]
+    individual_profiles = [p for p in profiles if p not in payer_members]
+    total_queries = len(individual_profiles) + (1 if payer_members else 0)
+    # `max_workers` acota el total de consultas simultáneas: se reparte entre los perfiles.
+    month_workers = min(MONTH_WORKERS, max(1, max_workers // max(1, total_queries)))
+
+    def run_profile(profile: str):
+        profile_for_query = None if profile == DEFAULT_PROFILE_LABEL else profile
+        return query_costs(
+            profile_for_query,
+            start,
+            end,
+            args.accounts,
+            exclude_credits=exclude_credits,
+            only_credits=only_credits,
+            group_by_account=by_account,
+            cache_path=cache_path,
+            resolve_names=resolve_names,
+            month_workers=month_workers,
+        )
 
-    for index, profile in enumerate(profiles, start=1):
-        display_name = DEFAULT_PROFILE_DISPLAY if profile == DEFAULT_PROFILE_LABEL else profile
-        status_message = f"# Getting data from profile ({index}/{total_profiles}): {display_name}"
-        show_status(status_message)
+    def run_payer():
+        return query_costs(
+            args.payer_profile,
+            start,
+            end,
+            member_accounts,
+            exclude_credits=exclude_credits,
+            only_credits=only_credits,
+            group_by_account=True,
+            cache_path=cache_path,
+            resolve_names=by_account and resolve_names,
+            month_workers=month_workers,
+        )
 
-        try:
-            profile_for_query = None if profile == DEFAULT_PROFILE_LABEL else profile
-            totals, account_names = query_costs(
-                profile_for_query,
-                start,
-                end,
-                args.accounts,
-                exclude_credits=exclude_credits,
-                only_credits=only_credits,
-                group_by_account=by_account,
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            clear_status()
-            print(f"# Error consultando perfil {profile}: {exc}")
+    # Cada perfil crea su propia sesión/cliente dentro del hilo que lo consulta.
+    profile_results: Dict[str, Tuple[Any, Dict[str, str]]] = {}
+    if total_queries:
+        with ThreadPoolExecutor(max_workers=min(max_workers, total_queries)) as executor:
+            futures = {executor.submit(run_profile, profile): profile for profile in individual_profiles}
+            payer_future = executor.submit(run_payer) if payer_members else None
+            if payer_future is not None:
+                futures[payer_future] = args.payer_profile
+            for index, future in enumerate(as_completed(futures), start=1):
+                profile = futures[future]
+                display_name = DEFAULT_PROFILE_DISPLAY if profile == DEFAULT_PROFILE_LABEL else profile
+                show_status(f"# Perfiles consultados ({index}/{total_queries}): {display_name}")
+                try:
+                    result = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    clear_status()
+                    print(f"# Error consultando perfil {profile}: {exc}")
+                    continue
+                if future is not payer_future:
+                    profile_results[profile] = result
+                    continue
+                totals_by_account, payer_names = cast(Tuple[Dict[str, Dict[str, int]], Dict[str, str]], result)
+                for member in payer_members:
+                    account_id = account_profiles[member]
+                    month_values = totals_by_account.get(account_id, {})
+                    if by_account:
+                        profile_results[member] = ({account_id: month_values} if month_values else {}, payer_names)
+                    else:
+                        profile_results[member] = (month_values, payer_names)
+
+    # Se agregan en el orden original de perfiles para mantener una salida estable.
+    for profile in profiles:
+        if profile not in profile_results:
             continue
+        totals, account_names = profile_results[profile]
+        display_name = DEFAULT_PROFILE_DISPLAY if profile == DEFAULT_PROFILE_LABEL else profile
 
         if by_account:
-            account_totals = cast(Dict[str, Dict[str, Decimal]], totals)
+            account_totals = cast(Dict[str, Dict[str, int]], totals)
             if not account_totals:
                 continue
             for account_id, month_values in account_totals.items():
@@ -428,7 +887,7 @@ def main() -> None:
                 results[row_key] = month_values
                 all_months.update(month_values.keys())
         else:
-            month_totals = cast(Dict[str, Decimal], totals)
+            month_totals = cast(Dict[str, int], totals)
             results[display_name] = month_totals
             all_months.update(month_totals.keys())
 
@@ -440,30 +899,37 @@ def main() -> None:
     sorted_months = sorted(all_months)
     month_labels = [month[:7] for month in sorted_months]  # YYYY-MM
 
-    # Prepara datos formateados
-    table_rows = []
-    raw_rows = []
-    for profile, totals in results.items():
-        row_display = [profile]
-        row_raw = [profile]
-        for month in sorted_months:
-            amount = totals.get(month, Decimal("0")).quantize(Decimal("1"))
-            raw_value = str(int(amount))
-            display_value = f"{int(amount):,}".replace(",", ".")
-            row_display.append(display_value)
-            row_raw.append(raw_value)
-        table_rows.append(row_display)
-        raw_rows.append(row_raw)
-
     headers = ["profile"] + month_labels
-    col_widths_display = [
-        max(len(headers[col]), max((len(row[col]) for row in table_rows), default=0))
-        for col in range(len(headers))
-    ]
-    col_widths_file = [
-        max(len(headers[col]), max((len(row[col]) for row in raw_rows), default=0))
-        for col in range(len(headers))
-    ]
+
+    def iter_raw_rows() -> Iterator[List[str]]:
+        """Genera las filas sin formato (para archivos) directamente desde `results`."""
+        for profile, totals in results.items():
+            yield [profile] + [str(micros_to_units(totals.get(month, 0))) for month in sorted_months]
+
+    # Prepara las filas de consola y calcula los anchos de columna en la misma pasada;
+    # las filas para archivos no se guardan, se regeneran al escribir cada archivo.
+    # Con --quiet se omite el formateo para consola, y los anchos del archivo de tabla
+    # solo se calculan si se va a generar (CSV/TSV no los necesitan).
+    show_table = not args.quiet
+    needs_file_widths = "table" in output_files
+    col_widths_display = [len(header) for header in headers]
+    col_widths_file = [len(header) for header in headers]
+    table_rows = []
+    if show_table or needs_file_widths:
+        for profile, totals in results.items():
+            row_display = [profile]
+            col_widths_display[0] = max(col_widths_display[0], len(profile))
+            col_widths_file[0] = max(col_widths_file[0], len(profile))
+            for col, month in enumerate(sorted_months, start=1):
+                amount = micros_to_units(totals.get(month, 0))
+                if needs_file_widths:
+                    col_widths_file[col] = max(col_widths_file[col], len(str(amount)))
+                if show_table:
+                    display_value = f"{amount:,d}".translate(THOUSANDS_SEPARATOR)
+                    row_display.append(display_value)
+                    col_widths_display[col] = max(col_widths_display[col], len(display_value))
+            if show_table:
+                table_rows.append(row_display)
 
     def format_row(values: List[str]) -> str:
         return " | ".join(
@@ -471,17 +937,18 @@ def main() -> None:
             for idx, value in enumerate(values)
         )
 
-    header_line = format_row(headers)
-    separator = "-+-".join("-" * col_widths_display[idx] for idx in range(len(headers)))
-    body_lines = [format_row(row) for row in table_rows]
+    if show_table:
+        header_line = format_row(headers)
+        separator = "-+-".join("-" * col_widths_display[idx] for idx in range(len(headers)))
+        body_lines = [format_row(row) for row in table_rows]
 
-    print()
-    if args.header:
-        print(header_line)
-        print(separator)
-    for line in body_lines:
-        print(line)
-    print()
+        print()
+        if args.header:
+            print(header_line)
+            print(separator)
+        for line in body_lines:
+            print(line)
+        print()
 
     # impresión en consola
     def format_row_file(values: List[str]) -> str:
@@ -495,27 +962,25 @@ def main() -> None:
         if fmt == "table":
             header_line_file = format_row_file(headers)
             separator_file = "-+-".join("-" * col_widths_file[idx] for idx in range(len(headers)))
-            body_lines_file = [format_row_file(row) for row in raw_rows]
 
+            lines = [header_line_file, separator_file, *(format_row_file(row) for row in iter_raw_rows())]
             with path.open("w", encoding="utf-8") as out_file:
-                out_file.write(header_line_file + "\n")
-                out_file.write(separator_file + "\n")
-                for line in body_lines_file:
-                    out_file.write(line + "\n")
+                out_file.write("\n".join(lines) + "\n")
         elif fmt == "csv":
             with path.open("w", encoding="utf-8", newline="") as out_file:
                 writer = csv.writer(out_file)
                 writer.writerow(headers)
-                for row in raw_rows:
-                    writer.writerow(row)
-        else:  # tsv
+                writer.writerows(iter_raw_rows())
+        else:  # tsv: unión directa; solo las filas con caracteres a escapar pasan por `csv`
             with path.open("w", encoding="utf-8", newline="") as out_file:
                 writer = csv.writer(out_file, delimiter="\t")
-                writer.writerow(headers)
-                for row in raw_rows:
-                    writer.writerow(row)
+                for row in (headers, *iter_raw_rows()):
+                    if any(char in value for value in row for char in TSV_SPECIAL_CHARS):
+                        writer.writerow(row)
+                    else:
+                        out_file.write("\t".join(row) + "\r\n")
 
-        export_paths.append(path.resolve())
+        export_paths.append(path)
 
     if export_paths:
         destinations = sorted({p.parent for p in export_paths})